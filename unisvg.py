@@ -2,19 +2,26 @@
 """
 Unicode Glyph to SVG Path Converter
 Supports Symbola.ttf (historical) and NotoSansMath (modern) fonts
+
+Library use: render(char, ...) returns the SVG text without a subprocess.
 """
 
 import argparse
+import bisect
+import functools
+import hashlib
+import io
+import pickle
 import sys
 import os
-import zipfile
-import tempfile
-import urllib.request
-import shutil
-from fontTools.ttLib import TTFont
-from fontTools.pens.svgPathPen import SVGPathPen
-from fontTools.pens.transformPen import TransformPen
-from fontTools.misc.transform import Transform
+import threading
+# urllib, zipfile, shutil and concurrent.futures are imported where used:
+# they are only needed for downloads and --batch, and importing them
+# up front costs every single-glyph run about 30 ms
+from fontTools.ttLib import TTFont, TTLibError
+from fontTools.pens.basePen import BasePen
+
+__all__ = ['render', 'UnicodeGlyphConverter']
 
 # Font configurations
 FONTS = {
@@ -39,17 +46,260 @@ FONTS = {
     }
 }
 
+# Font preference order for --auto and fallback lookups
+AUTO_FONT_ORDER = ('notomath', 'symbola', 'notosans')
+
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 FONTS_DIR = os.path.join(SCRIPT_DIR, "fonts")
+CACHE_DIR = os.path.join(os.environ.get('XDG_CACHE_HOME') or os.path.expanduser('~/.cache'), 'unisvg')
+# Bump when the pickled converter state or path output format changes
+CACHE_VERSION = 2
+
+# Centered glyph document; {d} is split out so the path data can be streamed
+_SVG_TEMPLATE = '''<?xml version="1.0" encoding="UTF-8"?>
+<svg xmlns="http://www.w3.org/2000/svg" 
+     viewBox="0 0 {viewbox} {viewbox}"
+     width="{viewbox}" 
+     height="{viewbox}">
+  <!-- Font: {font} -->
+  <!-- Character: {char} (U+{code:04X}) -->
+  <g transform="translate({x:.2f} {y:.2f})">
+    <path d="{d}" fill="{fill}"{stroke}/>
+  </g>
+</svg>'''
+
+# --minimal: the same document without comments
+_SVG_MINIMAL_TEMPLATE = '''<?xml version="1.0" encoding="UTF-8"?>
+<svg xmlns="http://www.w3.org/2000/svg" 
+     viewBox="0 0 {viewbox} {viewbox}"
+     width="{viewbox}" 
+     height="{viewbox}">
+  <g transform="translate({x:.2f} {y:.2f})">
+    <path d="{d}" fill="{fill}"{stroke}/>
+  </g>
+</svg>'''
+
+_SVG_PARTS = {False: _SVG_TEMPLATE.split('{d}'), True: _SVG_MINIMAL_TEMPLATE.split('{d}')}
+
+_PATH_TEMPLATE = '<path d="{d}" transform="translate({x:.2f} {y:.2f})" fill="{fill}"/>'
+
+# Serializes stderr output from concurrent font downloads
+_stderr_lock = threading.Lock()
+
+def _log(message=""):
+    """Write one line to stderr without interleaving across threads."""
+    with _stderr_lock:
+        sys.stderr.write(f"{message}\n")
+        sys.stderr.flush()
+
+def _fmt(value, precision=2):
+    """Return the shortest decimal string for value rounded to precision."""
+    text = format(value, f'.{precision}f')
+    if precision:
+        text = text.rstrip('0').rstrip('.')
+    if text.startswith('0.'):
+        return text[1:]
+    if text.startswith('-0.'):
+        return '-' + text[2:]
+    return '0' if text == '-0' else text
+
+def _cache_path(font_path, cache_dir):
+    """Cache file for font_path keyed by path, mtime and size, or None if disabled."""
+    if not cache_dir:
+        return None
+    stat = os.stat(font_path)
+    key = hashlib.blake2b(
+        os.fsencode(os.path.abspath(font_path))
+        + stat.st_mtime_ns.to_bytes(8, 'little')
+        + stat.st_size.to_bytes(8, 'little')
+        + CACHE_VERSION.to_bytes(2, 'little'),
+        digest_size=16).hexdigest()
+    return os.path.join(cache_dir, key + '.pkl')
+
+class _PathWriter:
+    """
+    Serialize absolute outline points as compact relative SVG path data.
+    
+    Points are rounded to precision before the offset from the current
+    point is taken, so rounding never accumulates along a contour.
+    Repeated command letters are dropped and no separator is written
+    before a negative number.
+    """
+    
+    def __init__(self, precision=2):
+        self.precision = precision
+        self._parts = []
+        self._command = None
+        self._x = self._y = 0.0
+        self._start = (0.0, 0.0)
+    
+    def _segment(self, command, points):
+        precision = self.precision
+        cx, cy = self._x, self._y
+        numbers = []
+        for i in range(0, len(points), 2):
+            x = round(points[i], precision)
+            y = round(points[i + 1], precision)
+            numbers.append(_fmt(x - cx, precision))
+            numbers.append(_fmt(y - cy, precision))
+        self._x, self._y = x, y
+        
+        # Drop a repeated command letter; "m" is always written since a
+        # bare coordinate pair after it would mean lineto
+        parts = self._parts
+        if command != self._command or command == 'm':
+            parts.append(command)
+            self._command = command
+        elif numbers[0][0] != '-':
+            parts.append(' ')
+        parts.append(numbers[0])
+        for number in numbers[1:]:
+            if number[0] != '-':
+                parts.append(' ')
+            parts.append(number)
+    
+    def move(self, x, y):
+        self._segment('m', (x, y))
+        self._start = (self._x, self._y)
+    
+    def line(self, x, y):
+        self._segment('l', (x, y))
+    
+    def quad(self, x1, y1, x, y):
+        self._segment('q', (x1, y1, x, y))
+    
+    def cubic(self, x1, y1, x2, y2, x, y):
+        self._segment('c', (x1, y1, x2, y2, x, y))
+    
+    def close(self):
+        self._parts.append('z')
+        self._command = 'z'
+        self._x, self._y = self._start
+    
+    def getvalue(self):
+        return ''.join(self._parts)
+
+class FastSVGPathPen(BasePen):
+    """
+    Pen that collects compact relative SVG path commands.
+    
+    Points are mapped through x * sx + tx, y * sy + ty inline, so no
+    TransformPen is needed in front of it.
+    """
+    
+    def __init__(self, glyph_set=None, sx=1.0, sy=1.0, tx=0.0, ty=0.0, precision=2):
+        super().__init__(glyph_set)
+        self._writer = _PathWriter(precision)
+        self.sx = sx
+        self.sy = sy
+        self.tx = tx
+        self.ty = ty
+    
+    def _moveTo(self, pt):
+        sx, sy, tx, ty = self.sx, self.sy, self.tx, self.ty
+        self._writer.move(pt[0] * sx + tx, pt[1] * sy + ty)
+    
+    def _lineTo(self, pt):
+        sx, sy, tx, ty = self.sx, self.sy, self.tx, self.ty
+        self._writer.line(pt[0] * sx + tx, pt[1] * sy + ty)
+    
+    def _curveToOne(self, pt1, pt2, pt3):
+        sx, sy, tx, ty = self.sx, self.sy, self.tx, self.ty
+        self._writer.cubic(pt1[0] * sx + tx, pt1[1] * sy + ty,
+                           pt2[0] * sx + tx, pt2[1] * sy + ty,
+                           pt3[0] * sx + tx, pt3[1] * sy + ty)
+    
+    def _qCurveToOne(self, pt1, pt2):
+        sx, sy, tx, ty = self.sx, self.sy, self.tx, self.ty
+        self._writer.quad(pt1[0] * sx + tx, pt1[1] * sy + ty,
+                          pt2[0] * sx + tx, pt2[1] * sy + ty)
+    
+    def _closePath(self):
+        self._writer.close()
+    
+    def getCommands(self):
+        return self._writer.getvalue()
+
+def _quadratic_contours_to_path(coordinates, end_pts, flags, sx, sy, tx, ty, offset=0,
+                                precision=2):
+    """
+    Convert simple TrueType contours straight to SVG path commands.
+    
+    Walks the glyf (coordinates, endPts, flags) arrays the same way
+    fontTools' Glyph.draw does, including implied on-curve midpoints, but
+    without per-segment pen dispatch. Output matches FastSVGPathPen.
+    Composite and cubic glyphs must go through the pen instead.
+    """
+    writer = _PathWriter(precision)
+    move_to = writer.move
+    line_to = writer.line
+    quad_to = writer.quad
+    
+    # Flat x0, y0, x1, y1, ... doubles; avoids GlyphCoordinates slicing
+    flat = coordinates.array
+    start = 0
+    for end in end_pts:
+        end += 1
+        xs = flat[2 * start:2 * end:2].tolist()
+        if offset:
+            xs = [x + offset for x in xs]
+        ys = flat[2 * start + 1:2 * end:2].tolist()
+        on_curve = [f & 1 for f in flags[start:end]]
+        start = end
+        
+        if 1 not in on_curve:
+            # No on-curve points: start at the implied midpoint of last and first
+            mx = 0.5 * (xs[-1] + xs[0])
+            my = 0.5 * (ys[-1] + ys[0])
+            move_to(mx * sx + tx, my * sy + ty)
+            xs.append(mx)
+            ys.append(my)
+            on_curve.append(1)
+        else:
+            # Rotate so the contour ends on-curve and start there
+            first_on = on_curve.index(1) + 1
+            xs = xs[first_on:] + xs[:first_on]
+            ys = ys[first_on:] + ys[:first_on]
+            on_curve = on_curve[first_on:] + on_curve[:first_on]
+            move_to(xs[-1] * sx + tx, ys[-1] * sy + ty)
+        
+        count = len(xs)
+        i = 0
+        while i < count:
+            j = on_curve.index(1, i)
+            if j == i:
+                # Final lineTo back to the start is implied by Z
+                if count - i > 1:
+                    line_to(xs[i] * sx + tx, ys[i] * sy + ty)
+            else:
+                for k in range(i, j - 1):
+                    x, y = xs[k], ys[k]
+                    quad_to(x * sx + tx, y * sy + ty,
+                            0.5 * (x + xs[k + 1]) * sx + tx, 0.5 * (y + ys[k + 1]) * sy + ty)
+                quad_to(xs[j - 1] * sx + tx, ys[j - 1] * sy + ty,
+                        xs[j] * sx + tx, ys[j] * sy + ty)
+            i = j + 1
+        writer.close()
+    
+    return writer.getvalue()
 
 class UnicodeGlyphConverter:
-    def __init__(self, font_name='symbola', auto_download=True):
+    # Print the Unicode block survey on load; off on the conversion hot path,
+    # enabled by --font-info and --verbose
+    show_ranges = False
+    # Max (codepoint, size) entries kept by glyph_to_path_data
+    path_cache_size = 4096
+    # Where parsed cmap and rendered paths persist between runs (None disables)
+    cache_dir = CACHE_DIR
+    
+    def __init__(self, font_name='symbola', auto_download=True, refresh=False):
         """
         Initialize converter with selected font.
         
         Args:
             font_name: 'symbola', 'notomath', or 'notosans'
             auto_download: Download font if not found
+            refresh: Re-check the download source even if the font exists
         """
         if font_name not in FONTS:
             raise ValueError(f"Unknown font: {font_name}. Choose from: {', '.join(FONTS.keys())}")
@@ -58,14 +308,22 @@ class UnicodeGlyphConverter:
         self.font_name = font_name
         self.font_path = os.path.join(FONTS_DIR, self.font_config['name'])
         self.font = None
-        self.glyph_set = None
-        self.unicode_map = {}
+        self._glyph_set = None
+        self._best_cmap = {}
+        self._cmap_verified = False
+        self._cache_dirty = False
+        self._glyph_pages = {}
+        self._unicode_map = None
+        self._sorted_codes = None
+        self._path_cache = {}
         
         # Ensure fonts directory exists
         os.makedirs(FONTS_DIR, exist_ok=True)
         
         # Download font if needed
-        if not os.path.exists(self.font_path):
+        if refresh and auto_download and os.path.exists(self.font_path):
+            self.download_font()
+        elif not os.path.exists(self.font_path):
             if auto_download:
                 self.download_font()
             else:
@@ -76,97 +334,246 @@ class UnicodeGlyphConverter:
         
         self.load_font()
     
+    def _fetch(self, url, target, headers=None, chunk_size=256 * 1024):
+        """
+        Stream url into a binary file object, reporting progress.
+        
+        Returns the response ETag (or None). A conditional request that is
+        not modified raises HTTPError with code 304.
+        """
+        import urllib.request
+        
+        request = urllib.request.Request(url, headers=headers or {})
+        with urllib.request.urlopen(request) as response:
+            total_size = int(response.headers.get('Content-Length') or 0)
+            done = 0
+            while True:
+                chunk = response.read(chunk_size)
+                if not chunk:
+                    break
+                target.write(chunk)
+                done += len(chunk)
+                if total_size > 0:
+                    with _stderr_lock:
+                        sys.stderr.write(f"\r  Downloading {os.path.basename(self.font_path)}: "
+                                         f"{done * 100 / total_size:.1f}%")
+                        sys.stderr.flush()
+            return response.headers.get('ETag')
+    
+    def _remote_size(self, url):
+        """Return Content-Length from a HEAD request, or None."""
+        import urllib.request
+        
+        try:
+            request = urllib.request.Request(url, method='HEAD')
+            with urllib.request.urlopen(request) as response:
+                return int(response.headers.get('Content-Length') or 0) or None
+        except (OSError, ValueError):
+            return None
+    
     def download_font(self):
-        """Download and extract font."""
-        print(f"Downloading {self.font_config['name']}...", file=sys.stderr)
-        print(f"Source: {self.font_config['url']}", file=sys.stderr)
+        """
+        Download and extract font.
+        
+        If the font already exists, the download is conditional: the saved
+        ETag is sent as If-None-Match, or for plain TTFs without an ETag the
+        remote Content-Length is compared with the local file size. If that
+        check fails (e.g. offline), the existing file is kept.
+        """
+        import shutil
+        import urllib.error
+        import zipfile
+        
+        url = self.font_config['url']
+        etag_path = self.font_path + '.etag'
+        part_path = self.font_path + '.part'
+        
+        headers = {}
+        have_font = os.path.exists(self.font_path)
+        if have_font:
+            saved_etag = None
+            if os.path.exists(etag_path):
+                with open(etag_path, 'r', encoding='utf-8') as f:
+                    saved_etag = f.read().strip()
+            if saved_etag:
+                headers['If-None-Match'] = saved_etag
+            elif (self.font_config['type'] == 'ttf'
+                  and self._remote_size(url) == os.path.getsize(self.font_path)):
+                _log(f"✓ {self.font_config['name']} is up to date")
+                return
+        
+        if have_font:
+            _log(f"Checking {self.font_config['name']} for updates...")
+        else:
+            _log(f"Downloading {self.font_config['name']}...")
+        _log(f"Source: {url}")
         
         try:
             if self.font_config['type'] == 'zip':
-                # Download ZIP file
-                zip_temp = tempfile.NamedTemporaryFile(suffix='.zip', delete=False)
-                zip_path = zip_temp.name
-                zip_temp.close()
-                
-                def report_progress(block_num, block_size, total_size):
-                    if total_size > 0:
-                        percent = (block_num * block_size / total_size) * 100
-                        sys.stderr.write(f"\r  Downloading: {percent:.1f}%")
-                        sys.stderr.flush()
-                
-                urllib.request.urlretrieve(self.font_config['url'], zip_path, report_progress)
-                print(f"\n  Extracting...", file=sys.stderr)
+                # Download ZIP into memory (no temp file round-trip)
+                zip_buffer = io.BytesIO()
+                etag = self._fetch(url, zip_buffer, headers)
+                _log(f"\n  Extracting...")
                 
                 # Extract specific file from ZIP
-                with zipfile.ZipFile(zip_path, 'r') as zip_ref:
-                    # Try to find the font file in ZIP
+                with zipfile.ZipFile(zip_buffer, 'r') as zip_ref:
+                    # Look up the known member path first, scan only as a fallback
                     target_file = None
-                    for file_info in zip_ref.infolist():
-                        if file_info.filename.endswith(self.font_config['name']):
-                            target_file = file_info.filename
-                            break
-                        elif 'zip_path' in self.font_config and file_info.filename == self.font_config['zip_path']:
-                            target_file = file_info.filename
-                            break
+                    try:
+                        target_file = zip_ref.getinfo(self.font_config.get('zip_path', '')).filename
+                    except KeyError:
+                        for file_info in zip_ref.infolist():
+                            if file_info.filename.endswith(self.font_config['name']):
+                                target_file = file_info.filename
+                                break
                     
                     if target_file:
                         # Extract to fonts directory
-                        with zip_ref.open(target_file) as source, open(self.font_path, 'wb') as target:
-                            shutil.copyfileobj(source, target)
-                        print(f"  Extracted: {target_file}", file=sys.stderr)
+                        with zip_ref.open(target_file) as source, open(part_path, 'wb') as target:
+                            shutil.copyfileobj(source, target, length=1024 * 1024)
+                        _log(f"  Extracted: {target_file}")
                     else:
                         # List files in ZIP for debugging
-                        print(f"  Files in ZIP:", file=sys.stderr)
+                        _log(f"  Files in ZIP:")
                         for file_info in zip_ref.infolist()[:10]:
-                            print(f"    {file_info.filename}", file=sys.stderr)
+                            _log(f"    {file_info.filename}")
                         raise ValueError(f"Font file not found in ZIP archive")
                 
-                # Clean up
-                os.unlink(zip_path)
-                
             else:  # Direct TTF download
-                def report_progress(block_num, block_size, total_size):
-                    if total_size > 0:
-                        percent = (block_num * block_size / total_size) * 100
-                        sys.stderr.write(f"\r  Downloading: {percent:.1f}%")
-                        sys.stderr.flush()
-                
-                urllib.request.urlretrieve(self.font_config['url'], self.font_path, report_progress)
-                print(f"\n", file=sys.stderr)
+                with open(part_path, 'wb') as target:
+                    etag = self._fetch(url, target, headers)
+                _log(f"\n")
             
-            print(f"✓ Downloaded to: {self.font_path}", file=sys.stderr)
+            os.replace(part_path, self.font_path)
+            if etag:
+                with open(etag_path, 'w', encoding='utf-8') as f:
+                    f.write(etag)
+            
+            _log(f"✓ Downloaded to: {self.font_path}")
             file_size = os.path.getsize(self.font_path)
-            print(f"  File size: {file_size:,} bytes", file=sys.stderr)
+            _log(f"  File size: {file_size:,} bytes")
             
+        except urllib.error.HTTPError as e:
+            if os.path.exists(part_path):
+                os.unlink(part_path)
+            if e.code == 304:
+                _log(f"\n✓ {self.font_config['name']} is up to date")
+                return
+            if have_font:
+                _log(f"\n⚠ Could not check {self.font_config['name']} for updates ({e}), keeping existing file")
+                return
+            raise RuntimeError(f"Download failed: {e}")
         except Exception as e:
-            if os.path.exists(self.font_path):
-                os.unlink(self.font_path)
+            if os.path.exists(part_path):
+                os.unlink(part_path)
+            if have_font:
+                _log(f"\n⚠ Could not check {self.font_config['name']} for updates ({e}), keeping existing file")
+                return
             raise RuntimeError(f"Download failed: {e}")
     
     def load_font(self):
         """Load font and build Unicode mapping."""
         try:
-            print(f"\nLoading {self.font_config['name']}...", file=sys.stderr)
-            self.font = TTFont(self.font_path)
-            self.glyph_set = self.font.getGlyphSet()
+            _log(f"\nLoading {self.font_config['name']}...")
+            self.font = TTFont(self.font_path, lazy=True)
+            self._glyph_set = None
+            self._glyph_pages = {}
+            self._unicode_map = None
+            self._sorted_codes = None
             
-            # Build Unicode mapping
-            self.unicode_map = {}
-            for table in self.font['cmap'].tables:
-                for code, name in table.cmap.items():
-                    if name in self.glyph_set:
-                        self.unicode_map[code] = name
+            # Best subtable (format 12 before 4); unicode_map is built on demand
+            if not self.load_cache():
+                self._best_cmap = self.font['cmap'].getBestCmap() or {}
+                self._cmap_verified = False
+                self._cache_dirty = True
             
-            print(f"✓ Font loaded successfully", file=sys.stderr)
-            print(f"  Glyphs: {len(self.glyph_set):,}", file=sys.stderr)
-            print(f"  Unicode characters: {len(self.unicode_map):,}", file=sys.stderr)
+            _log(f"✓ Font loaded successfully")
+            _log(f"  Glyphs: {self.font['maxp'].numGlyphs:,}")
+            _log(f"  Unicode characters: {len(self._best_cmap):,}")
             
             # Show supported ranges
-            self.show_supported_ranges()
+            if self.show_ranges:
+                self.show_supported_ranges()
             
         except Exception as e:
             raise RuntimeError(f"Failed to load font: {e}")
     
+    @property
+    def glyph_set(self):
+        """Glyph set of the font, loaded on first access."""
+        if self._glyph_set is None:
+            self._glyph_set = self.font.getGlyphSet()
+        return self._glyph_set
+    
+    def _cache_file(self):
+        """Cache path keyed by font path, mtime and size, or None if disabled."""
+        return _cache_path(self.font_path, self.cache_dir)
+    
+    def load_cache(self, path=None):
+        """
+        Restore cmap and rendered paths pickled by save_cache().
+        
+        Returns True if the cache was loaded. A warm cache lets cached
+        characters render without building the glyph set at all.
+        """
+        path = path or self._cache_file()
+        if not path or not os.path.exists(path):
+            return False
+        try:
+            with open(path, 'rb') as f:
+                state = pickle.load(f)
+            best_cmap, path_cache = state['cmap'], state['paths']
+        except Exception:
+            return False
+        
+        self._best_cmap = best_cmap
+        self._path_cache = path_cache
+        self._cmap_verified = True
+        self._cache_dirty = False
+        return True
+    
+    def save_cache(self, path=None):
+        """Pickle the cmap and rendered paths if they changed since loading."""
+        path = path or self._cache_file()
+        if not path or not self._cache_dirty:
+            return
+        
+        # Store only entries whose glyph exists, so lookups can skip the check
+        if not self._cmap_verified:
+            glyph_set = self.glyph_set
+            self._best_cmap = {code: name for code, name in self._best_cmap.items()
+                               if name in glyph_set}
+            self._cmap_verified = True
+        
+        # The cache is best-effort: an unwritable cache dir is not an error
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            temp_path = f"{path}.{os.getpid()}.tmp"
+            with open(temp_path, 'wb') as f:
+                pickle.dump({'cmap': self._best_cmap, 'paths': self._path_cache}, f,
+                            protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temp_path, path)
+            self._cache_dirty = False
+        except OSError:
+            pass
+    
+    @property
+    def unicode_map(self):
+        """Full codepoint → glyph name mapping, built on first access."""
+        if self._unicode_map is None:
+            # getReverseGlyphMap() is cached by fontTools and only used as a name filter
+            glyph_ids = self.font.getReverseGlyphMap()
+            self._unicode_map = {code: name for code, name in self._best_cmap.items()
+                                 if name in glyph_ids}
+        return self._unicode_map
+    
+    @property
+    def sorted_codes(self):
+        """Sorted list of supported codepoints, built on first access."""
+        if self._sorted_codes is None:
+            self._sorted_codes = sorted(self.unicode_map)
+        return self._sorted_codes
+    
     def show_supported_ranges(self):
         """Display supported Unicode ranges."""
         if not self.unicode_map:
@@ -191,23 +598,44 @@ class UnicodeGlyphConverter:
             ('Superscripts and Subscripts', 0x2070, 0x209F),
         ]
         
+        codes = self.sorted_codes
         print(f"\nSupported Unicode ranges:", file=sys.stderr)
         for block_name, start, end in unicode_blocks:
-            count = sum(1 for code in self.unicode_map if start <= code <= end)
+            count = bisect.bisect_right(codes, end) - bisect.bisect_left(codes, start)
             if count > 0:
                 total_chars = end - start + 1
                 percentage = (count / total_chars) * 100
                 print(f"  {block_name:30} {count:4} / {total_chars:4} ({percentage:5.1f}%)", file=sys.stderr)
     
+    def _glyph_page(self, page_index):
+        """
+        Return the 256-entry glyph name table covering page_index * 256 onward.
+        
+        Pages are built on first use from the best cmap, with unmapped or
+        missing glyphs stored as None, so lookups become a single index.
+        """
+        page = self._glyph_pages.get(page_index)
+        if page is None:
+            base = page_index << 8
+            best_cmap = self._best_cmap
+            names = [best_cmap.get(code) for code in range(base, base + 256)]
+            if not self._cmap_verified and any(names):
+                glyph_set = self.glyph_set
+                names = [name if name is not None and name in glyph_set else None
+                         for name in names]
+            page = tuple(names)
+            self._glyph_pages[page_index] = page
+        return page
+    
+    def _lookup_glyph_name(self, char_code):
+        """Return glyph name for a codepoint, or None if unmapped."""
+        return self._glyph_page(char_code >> 8)[char_code & 0xFF]
+    
     def check_character_support(self, char):
         """Check if character is supported."""
         char_code = ord(char)
-        
-        if char_code in self.unicode_map:
-            glyph_name = self.unicode_map[char_code]
-            return True, glyph_name, char_code
-        else:
-            return False, None, char_code
+        glyph_name = self._lookup_glyph_name(char_code)
+        return glyph_name is not None, glyph_name, char_code
     
     def try_multiple_fonts(self, char, fonts_to_try=None):
         """
@@ -215,26 +643,26 @@ class UnicodeGlyphConverter:
         Returns (font_name, glyph_name, char_code) for first successful match.
         """
         if fonts_to_try is None:
-            fonts_to_try = ['notomath', 'symbola', 'notosans']
+            fonts_to_try = AUTO_FONT_ORDER
         
-        for font_name in fonts_to_try:
-            try:
-                converter = UnicodeGlyphConverter(font_name, auto_download=False)
-                supported, glyph_name, char_code = converter.check_character_support(char)
-                if supported:
-                    return font_name, glyph_name, char_code
-            except:
-                continue
+        font_name = _auto_font_map(tuple(fonts_to_try)).get(ord(char))
+        if font_name is None:
+            return None, None, ord(char)
         
-        return None, None, ord(char)
+        supported, glyph_name, char_code = _get_converter(font_name).check_character_support(char)
+        if not supported:
+            return None, None, char_code
+        return font_name, glyph_name, char_code
     
     def get_glyph_bbox(self, glyph):
         """Get glyph bounding box with multiple fallback methods."""
         try:
             # Method 1: From glyf table
             if 'glyf' in self.font:
-                if hasattr(glyph, 'name'):
-                    glyf_glyph = self.font['glyf'].glyphs.get(glyph.name)
+                glyf_table = self.font['glyf']
+                if hasattr(glyph, 'name') and glyph.name in glyf_table:
+                    # Indexing (not .glyphs) expands lazily loaded glyphs
+                    glyf_glyph = glyf_table[glyph.name]
                     if glyf_glyph and hasattr(glyf_glyph, 'xMin'):
                         return (glyf_glyph.xMin, glyf_glyph.yMin, glyf_glyph.xMax, glyf_glyph.yMax)
             
@@ -249,16 +677,34 @@ class UnicodeGlyphConverter:
         except Exception:
             return (0, -150, 500, 700)
     
-    def glyph_to_path_data(self, char, target_size=432):
-        """Convert character to SVG path data."""
+    def glyph_to_path_data(self, char, target_size=432, precision=2):
+        """Convert character to SVG path data with precision decimals."""
         if not self.font:
             raise ValueError("Font not loaded")
         
         char_code = ord(char)
-        if char_code not in self.unicode_map:
+        cache_key = (char_code, target_size, precision)
+        cached = self._path_cache.pop(cache_key, None)
+        if cached is not None:
+            # Re-insert so eviction drops the least recently used entry
+            self._path_cache[cache_key] = cached
+            return cached
+        
+        glyph_name = self._lookup_glyph_name(char_code)
+        if glyph_name is None:
             raise ValueError(f"Character '{char}' (U+{char_code:04X}) not in {self.font_config['name']}")
         
-        glyph_name = self.unicode_map[char_code]
+        result = self._draw_glyph_path(glyph_name, target_size, precision)
+        
+        # Evict the least recently used entry once the cache is full
+        if len(self._path_cache) >= self.path_cache_size:
+            del self._path_cache[next(iter(self._path_cache))]
+        self._path_cache[cache_key] = result
+        self._cache_dirty = True
+        return result
+    
+    def _draw_glyph_path(self, glyph_name, target_size, precision=2):
+        """Draw a glyph scaled to target_size and return (path, bbox, scale, name)."""
         glyph = self.glyph_set[glyph_name]
         
         # Get bounding box
@@ -273,19 +719,40 @@ class UnicodeGlyphConverter:
         max_dimension = max(glyph_width, glyph_height)
         scale = target_size / max_dimension if max_dimension > 0 else 1.0
         
-        # Create transform: scale and flip Y
-        transform = Transform().scale(scale, -scale).translate(-bbox[0], -bbox[3])
+        # Draw to path: scale, flip Y and move bbox origin to (0, 0)
+        sx, sy, tx, ty = scale, -scale, -bbox[0] * scale, bbox[3] * scale
+        
+        # Simple quadratic glyphs skip the pen protocol entirely
+        glyf_glyph = self.font['glyf'][glyph_name] if 'glyf' in self.font else None
+        if (glyf_glyph is not None and not glyf_glyph.isComposite()
+                and glyf_glyph.numberOfContours > 0 and not any(f & 0x80 for f in glyf_glyph.flags)):
+            coordinates, end_pts, flags = glyf_glyph.getCoordinates(self.font['glyf'])
+            offset = self.font['hmtx'][glyph_name][1] - glyf_glyph.xMin
+            path_data = _quadratic_contours_to_path(coordinates, end_pts, flags,
+                                                    sx, sy, tx, ty, offset, precision)
+            return path_data, bbox, scale, glyph_name
         
-        # Draw to path
-        svg_pen = SVGPathPen(self.glyph_set)
-        transform_pen = TransformPen(svg_pen, transform)
-        glyph.draw(transform_pen)
+        svg_pen = FastSVGPathPen(self.glyph_set, sx, sy, tx, ty, precision)
+        glyph.draw(svg_pen)
         
         return svg_pen.getCommands(), bbox, scale, glyph_name
     
     def create_centered_svg(self, char, viewbox_size=1024, target_size=432, 
-                           fill_color="black", stroke_color="none", stroke_width=0):
+                           fill_color="black", stroke_color="none", stroke_width=0,
+                           precision=2, minimal=False):
         """Create SVG with centered glyph."""
+        return ''.join(self.iter_centered_svg(char, viewbox_size, target_size, fill_color,
+                                              stroke_color, stroke_width, precision, minimal))
+    
+    def iter_centered_svg(self, char, viewbox_size=1024, target_size=432,
+                          fill_color="black", stroke_color="none", stroke_width=0,
+                          precision=2, minimal=False):
+        """
+        Yield the centered glyph SVG in chunks: header, path data, footer.
+        
+        Lets main() stream the document to a file without joining it first.
+        With minimal, the comment lines are left out of the template.
+        """
         try:
             # Check support
             supported, glyph_name, char_code = self.check_character_support(char)
@@ -294,17 +761,19 @@ class UnicodeGlyphConverter:
                 # Try other fonts
                 alt_font, alt_glyph_name, char_code = self.try_multiple_fonts(char)
                 if alt_font:
-                    print(f"⚠ '{char}' not in {self.font_name}, using {alt_font} instead", file=sys.stderr)
+                    _log(f"⚠ '{char}' not in {self.font_name}, using {alt_font} instead")
                     # Create converter for alternative font
-                    alt_converter = UnicodeGlyphConverter(alt_font, auto_download=False)
-                    return alt_converter.create_centered_svg(
-                        char, viewbox_size, target_size, fill_color, stroke_color, stroke_width
+                    alt_converter = _get_converter(alt_font)
+                    yield from alt_converter.iter_centered_svg(
+                        char, viewbox_size, target_size, fill_color, stroke_color, stroke_width,
+                        precision, minimal
                     )
+                    return
                 else:
                     raise ValueError(f"Character '{char}' not found in any available font")
             
             # Get path data
-            path_data, bbox, scale, glyph_name = self.glyph_to_path_data(char, target_size)
+            path_data, bbox, scale, glyph_name = self.glyph_to_path_data(char, target_size, precision)
             
             # Calculate centering
             glyph_width = bbox[2] - bbox[0]
@@ -321,31 +790,25 @@ class UnicodeGlyphConverter:
                 stroke_attrs = f' stroke="{stroke_color}" stroke-width="{stroke_width}"'
             
             # Build SVG
-            svg = f'''<?xml version="1.0" encoding="UTF-8"?>
-<svg xmlns="http://www.w3.org/2000/svg" 
-     viewBox="0 0 {viewbox_size} {viewbox_size}"
-     width="{viewbox_size}" 
-     height="{viewbox_size}">
-  <!-- Font: {self.font_name} -->
-  <!-- Character: {char} (U+{char_code:04X}) -->
-  <g transform="translate({center_x:.2f} {center_y:.2f})">
-    <path d="{path_data}" fill="{fill_color}"{stroke_attrs}/>
-  </g>
-</svg>'''
+            fields = {'viewbox': viewbox_size, 'font': self.font_name, 'char': char,
+                      'code': char_code, 'x': center_x, 'y': center_y,
+                      'fill': fill_color, 'stroke': stroke_attrs}
+            head, tail = _SVG_PARTS[bool(minimal)]
+            yield head.format_map(fields)
+            yield path_data
+            yield tail.format_map(fields)
             
             # Print info
-            print(f"\n✓ Conversion successful", file=sys.stderr)
-            print(f"  Character: {char} (U+{char_code:04X})", file=sys.stderr)
-            print(f"  Font: {self.font_name}", file=sys.stderr)
-            print(f"  Glyph: {glyph_name}", file=sys.stderr)
-            print(f"  Size: {scaled_width:.1f} × {scaled_height:.1f}", file=sys.stderr)
-            print(f"  Position: ({center_x:.1f}, {center_y:.1f})", file=sys.stderr)
-            
-            return svg
+            _log(f"\n✓ Conversion successful")
+            _log(f"  Character: {char} (U+{char_code:04X})")
+            _log(f"  Font: {self.font_name}")
+            _log(f"  Glyph: {glyph_name}")
+            _log(f"  Size: {scaled_width:.1f} × {scaled_height:.1f}")
+            _log(f"  Position: ({center_x:.1f}, {center_y:.1f})")
             
         except Exception as e:
-            print(f"Error: {e}", file=sys.stderr)
-            return self.create_error_svg(viewbox_size, str(e))
+            _log(f"Error: {e}")
+            yield self.create_error_svg(viewbox_size, str(e))
     
     def create_error_svg(self, viewbox_size, error_msg):
         """Create error SVG."""
@@ -358,12 +821,12 @@ class UnicodeGlyphConverter:
   </text>
 </svg>'''
     
-    def create_path_only(self, char, target_size=432, fill_color="black"):
+    def create_path_only(self, char, target_size=432, fill_color="black", precision=2):
         """Return only the centered path element."""
         try:
-            path_data, bbox, scale, glyph_name = self.glyph_to_path_data(char, target_size)
+            path_data, bbox, scale, glyph_name = self.glyph_to_path_data(char, target_size, precision)
             
-            if not path_data.strip():
+            if not path_data:
                 return f'<!-- Empty glyph -->'
             
             # Calculate centering
@@ -375,12 +838,205 @@ class UnicodeGlyphConverter:
             center_x = (1024 - scaled_width) / 2
             center_y = (1024 - scaled_height) / 2
             
-            return f'<path d="{path_data}" transform="translate({center_x:.2f} {center_y:.2f})" fill="{fill_color}"/>'
+            return _PATH_TEMPLATE.format_map({'d': path_data, 'x': center_x, 'y': center_y,
+                                              'fill': fill_color})
             
         except Exception as e:
             return f'<!-- Error: {e} -->'
 
-def main():
+def _write_stdout(text):
+    """Write text plus a newline to stdout as UTF-8 bytes."""
+    buffer = getattr(sys.stdout, 'buffer', None)
+    if buffer is None:
+        # Replaced text stream (e.g. io.StringIO) without a byte buffer
+        print(text)
+        return
+    data = text.encode('utf-8') + b'\n'
+    if len(data) > 64 * 1024:
+        # Large payloads bypass the buffered writer: flush what is
+        # pending, then hand the bytes straight to the file descriptor
+        try:
+            fd = buffer.fileno()
+        except (AttributeError, OSError, ValueError):
+            fd = None
+        if fd is not None:
+            buffer.flush()
+            view = memoryview(data)
+            while view:
+                view = view[os.write(fd, view):]
+            return
+    buffer.write(data)
+
+def _downloaded_fonts():
+    """Return the ids of fonts whose file is present in FONTS_DIR."""
+    return frozenset(font_id for font_id, config in FONTS.items()
+                     if os.path.exists(os.path.join(FONTS_DIR, config['name'])))
+
+@functools.lru_cache(maxsize=None)
+def _get_converter(font_name):
+    """Return a shared converter for an already downloaded font."""
+    return UnicodeGlyphConverter(font_name, auto_download=False)
+
+@functools.lru_cache(maxsize=None)
+def _font_cmap(path):
+    """
+    Best cmap of the font at path, read from the converter cache if warm.
+    
+    Only entries whose glyph exists are kept, as in the verified cmap the
+    converter caches, so --auto never picks a font for a missing glyph.
+    """
+    cache_path = _cache_path(path, UnicodeGlyphConverter.cache_dir)
+    if cache_path and os.path.exists(cache_path):
+        try:
+            with open(cache_path, 'rb') as f:
+                return pickle.load(f)['cmap']
+        except Exception:
+            pass
+    font = TTFont(path, lazy=True)
+    try:
+        names = font.getReverseGlyphMap()
+        return {code: name for code, name in (font['cmap'].getBestCmap() or {}).items()
+                if name in names}
+    finally:
+        font.close()
+
+def _font_covers(path, codepoint):
+    """Return True if the font at path maps codepoint, without building a converter."""
+    return codepoint in _font_cmap(path)
+
+@functools.lru_cache(maxsize=None)
+def _auto_font_map(font_ids=AUTO_FONT_ORDER):
+    """Map every codepoint to the first downloaded font in font_ids covering it."""
+    font_map = {}
+    # Lowest priority first so preferred fonts overwrite
+    for font_id in reversed(font_ids):
+        font_path = os.path.join(FONTS_DIR, FONTS[font_id]['name'])
+        if not os.path.exists(font_path):
+            continue
+        # _font_cmap closes the font, so no file offset is shared with
+        # --batch worker processes forked afterwards
+        try:
+            cmap = _font_cmap(font_path)
+        except (OSError, KeyError, TTLibError):
+            continue
+        font_map.update(dict.fromkeys(cmap, font_id))
+    return font_map
+
+def _auto_converter(char, available_fonts):
+    """
+    Pick the converter for char the way --auto does.
+    
+    Tries AUTO_FONT_ORDER, then any downloaded font. Returns
+    (converter, font_id) and raises ValueError if no font can be loaded.
+    """
+    # Probe each cmap and only build a converter for the winner
+    for font_id in AUTO_FONT_ORDER:
+        if font_id not in available_fonts:
+            continue
+        font_path = os.path.join(FONTS_DIR, FONTS[font_id]['name'])
+        # Only unreadable or broken fonts are skipped; coverage is a plain test
+        try:
+            if not _font_covers(font_path, ord(char)):
+                continue
+            converter = _get_converter(font_id)
+        except (OSError, KeyError, RuntimeError, TTLibError):
+            continue
+        if converter.check_character_support(char)[0]:
+            return converter, font_id
+    
+    # Try any available font
+    for font_id in FONTS:
+        if font_id in available_fonts:
+            try:
+                return _get_converter(font_id), font_id
+            except (OSError, RuntimeError):
+                continue
+    
+    raise ValueError("No fonts available. Download fonts first.")
+
+def render(char, font=None, size=432, viewbox=1024, color="black", stroke="none",
+           stroke_width=0, precision=2, minimal=False, path_only=False):
+    """
+    Render char as a centered SVG document, or a bare <path> with path_only.
+    
+    font is a FONTS key; None picks a font like --auto. Converters are
+    shared between calls, so repeated renders reuse the loaded font and
+    its path cache. Fonts must already be downloaded.
+    
+    Raises ValueError if char is not in the font (for full SVGs, nor in
+    any fallback font) instead of returning the CLI's error placeholder.
+    """
+    if font is None:
+        converter, _ = _auto_converter(char, _downloaded_fonts())
+    else:
+        converter = _get_converter(font)
+    
+    if not converter.check_character_support(char)[0]:
+        if path_only or converter.try_multiple_fonts(char)[0] is None:
+            raise ValueError(f"Character '{char}' (U+{ord(char):04X}) not supported "
+                             f"by {converter.font_name}")
+    
+    if path_only:
+        return converter.create_path_only(char, size, color, precision)
+    return converter.create_centered_svg(char, viewbox, size, color, stroke, stroke_width,
+                                         precision, minimal)
+
+def _batch_chars(text, batch_format='one-per-line'):
+    """Split --batch-file text into the characters to convert."""
+    if batch_format == 'concatenated':
+        return ''.join(text.split())
+    return ''.join(line.strip()[0] for line in text.splitlines() if line.strip())
+
+def _render_one(task):
+    """Render one --batch character to a file and return (ok, status line)."""
+    i, char, font_id, dir_prefix, args = task
+    try:
+        if font_id is None:
+            return False, f"  {i+1:3d}. {char}: No font supports this character"
+        converter = _get_converter(font_id)
+        
+        # A missing glyph still writes the error SVG but counts as a failure
+        supported = (converter.check_character_support(char)[0]
+                     or converter.try_multiple_fonts(char)[0] is not None)
+        
+        svg = converter.create_centered_svg(
+            char, args.viewbox, args.size,
+            args.color, args.stroke, args.stroke_width, args.precision
+        )
+        
+        # Create filename
+        font_suffix = f"_{converter.font_name}" if args.auto else ""
+        filename = f"{i:03d}_U{ord(char):04X}{font_suffix}.svg"
+        filepath = dir_prefix + filename
+        
+        with open(filepath, 'wb') as f:
+            f.write(svg.encode('utf-8'))
+        
+        if not supported:
+            return False, f"  {i+1:3d}. {char}: Not supported, error SVG → {filename}"
+        return True, f"  {i+1:3d}. {char} → {filename}"
+        
+    except Exception as e:
+        return False, f"  {i+1:3d}. {char}: ERROR - {e}"
+
+def _print_missing_font(error):
+    """Report a missing font file with the command that downloads it."""
+    print(f"\nERROR: {error}", file=sys.stderr)
+    print(f"\nDownload fonts first:", file=sys.stderr)
+    print(f"  python {os.path.basename(__file__)} --download-all", file=sys.stderr)
+
+def _precision(value):
+    """argparse type for --precision: a non-negative number of decimals."""
+    try:
+        precision = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid int value: '{value}'")
+    if precision < 0:
+        raise argparse.ArgumentTypeError(f"must be 0 or more, got {precision}")
+    return precision
+
+def main(argv=None):
+    """Run the command line interface on argv and return the exit code."""
     parser = argparse.ArgumentParser(
         description='Convert Unicode glyphs to SVG using multiple fonts',
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -410,6 +1066,8 @@ Examples:
     font_group = parser.add_argument_group('Font Management')
     font_group.add_argument('--download', choices=list(FONTS.keys()) + ['all'],
                           help='Download specific font or all fonts')
+    font_group.add_argument('--refresh', action='store_true',
+                          help='With --download, check fonts already on disk for updates')
     font_group.add_argument('--list-fonts', action='store_true',
                           help='List available fonts')
     font_group.add_argument('--font-info', metavar='FONT',
@@ -423,6 +1081,8 @@ Examples:
                           help='Font to use (default: symbola)')
     conv_group.add_argument('--auto', action='store_true',
                           help='Auto-select font (notomath → symbola → notosans)')
+    conv_group.add_argument('--no-cache', action='store_true',
+                          help=f'Do not read or write the font cache in {CACHE_DIR}')
     
     # Output settings
     output_group = parser.add_argument_group('Output Settings')
@@ -436,6 +1096,8 @@ Examples:
                             help='Stroke color (default: none)')
     output_group.add_argument('--stroke-width', type=float, default=0,
                             help='Stroke width (default: 0)')
+    output_group.add_argument('--precision', type=_precision, default=2, metavar='N',
+                            help='Decimal places in path coordinates (default: 2)')
     
     # Output format
     format_group = parser.add_argument_group('Output Format')
@@ -450,6 +1112,8 @@ Examples:
                           help='Check character support in all fonts')
     info_group.add_argument('--compare', metavar='CHAR',
                           help='Compare character in all fonts')
+    info_group.add_argument('--verbose', action='store_true',
+                          help='Show supported Unicode ranges when loading fonts')
     
     # Batch operations
     batch_group = parser.add_argument_group('Batch Operations')
@@ -457,48 +1121,89 @@ Examples:
                            help='Convert all characters in string')
     batch_group.add_argument('--batch-dir', metavar='DIR', default='glyphs',
                            help='Output directory for batch (default: glyphs)')
+    batch_group.add_argument('--batch-file', metavar='FILE',
+                           help="Convert characters read from FILE ('-' for stdin); "
+                                "with --path-only, print one path per line")
+    batch_group.add_argument('--batch-format', choices=['one-per-line', 'concatenated'],
+                           default='one-per-line',
+                           help='Layout of --batch-file: first character of each line, '
+                                'or every non-whitespace character (default: one-per-line)')
+    
+    args = parser.parse_args(argv)
     
-    args = parser.parse_args()
+    # CLI options are applied as class settings for this run only, so
+    # later render() calls in the same process see the defaults again
+    saved = UnicodeGlyphConverter.show_ranges, UnicodeGlyphConverter.cache_dir
+    UnicodeGlyphConverter.show_ranges = args.verbose
+    if args.no_cache:
+        UnicodeGlyphConverter.cache_dir = None
+    try:
+        return _run_cli(parser, args)
+    finally:
+        UnicodeGlyphConverter.show_ranges, UnicodeGlyphConverter.cache_dir = saved
+
+def _run_cli(parser, args):
+    """Carry out the command selected by parsed args and return the exit code."""
+    # Fonts present on disk, checked once instead of per character × font
+    available_fonts = _downloaded_fonts()
     
     # Font management commands
     if args.list_fonts:
         print("Available fonts:", file=sys.stderr)
         for font_id, config in FONTS.items():
-            exists = os.path.exists(os.path.join(FONTS_DIR, config['name']))
-            status = "✓" if exists else "✗"
+            status = "✓" if font_id in available_fonts else "✗"
             print(f"  {font_id:10} {status} {config['description']}", file=sys.stderr)
-        return
+        return 0
     
     if args.download:
         if args.download == 'all':
-            for font_id in FONTS:
+            # Downloads are network-bound and independent: run them concurrently
+            from concurrent.futures import ThreadPoolExecutor
+            with ThreadPoolExecutor(max_workers=len(FONTS)) as executor:
+                futures = {font_id: executor.submit(UnicodeGlyphConverter, font_id,
+                                                    auto_download=True, refresh=args.refresh)
+                           for font_id in FONTS}
+            
+            print(f"\n=== Download summary ===", file=sys.stderr)
+            status = 0
+            for font_id, future in futures.items():
                 try:
-                    print(f"\n=== Downloading {font_id} ===", file=sys.stderr)
-                    converter = UnicodeGlyphConverter(font_id, auto_download=True)
+                    future.result()
+                    print(f"  {font_id:10} ✓", file=sys.stderr)
                 except Exception as e:
-                    print(f"  Failed: {e}", file=sys.stderr)
-        else:
-            try:
-                converter = UnicodeGlyphConverter(args.download, auto_download=True)
-                print(f"\n✓ {args.download} downloaded successfully", file=sys.stderr)
-            except Exception as e:
-                print(f"Error: {e}", file=sys.stderr)
-        return
+                    print(f"  {font_id:10} Failed: {e}", file=sys.stderr)
+                    status = 1
+            return status
+        
+        if args.download in available_fonts and not args.refresh:
+            print(f"✓ {args.download} already downloaded (use --refresh to check for updates)",
+                  file=sys.stderr)
+            return 0
+        try:
+            converter = UnicodeGlyphConverter(args.download, auto_download=True, refresh=args.refresh)
+            print(f"\n✓ {args.download} downloaded successfully", file=sys.stderr)
+        except Exception as e:
+            print(f"Error: {e}", file=sys.stderr)
+            return 1
+        return 0
     
     if args.font_info:
         if args.font_info not in FONTS:
             print(f"Unknown font: {args.font_info}", file=sys.stderr)
-            return
+            return 1
         
-        font_path = os.path.join(FONTS_DIR, FONTS[args.font_info]['name'])
-        if os.path.exists(font_path):
-            try:
-                converter = UnicodeGlyphConverter(args.font_info, auto_download=False)
-            except Exception as e:
-                print(f"Error: {e}", file=sys.stderr)
-        else:
+        if args.font_info not in available_fonts:
+            font_path = os.path.join(FONTS_DIR, FONTS[args.font_info]['name'])
             print(f"Font not downloaded: {font_path}", file=sys.stderr)
-        return
+            return 1
+        
+        try:
+            UnicodeGlyphConverter.show_ranges = True
+            converter = UnicodeGlyphConverter(args.font_info, auto_download=False)
+        except Exception as e:
+            print(f"Error: {e}", file=sys.stderr)
+            return 1
+        return 0
     
     # Check character in all fonts
     if args.check:
@@ -506,10 +1211,9 @@ Examples:
         print(f"Checking '{char}' (U+{ord(char):04X}):", file=sys.stderr)
         
         for font_id in FONTS:
-            font_path = os.path.join(FONTS_DIR, FONTS[font_id]['name'])
-            if os.path.exists(font_path):
+            if font_id in available_fonts:
                 try:
-                    converter = UnicodeGlyphConverter(font_id, auto_download=False)
+                    converter = _get_converter(font_id)
                     supported, glyph_name, char_code = converter.check_character_support(char)
                     status = "✓" if supported else "✗"
                     print(f"  {font_id:10} {status} {glyph_name or 'Not supported'}", file=sys.stderr)
@@ -517,7 +1221,7 @@ Examples:
                     print(f"  {font_id:10} ✗ Error: {e}", file=sys.stderr)
             else:
                 print(f"  {font_id:10} ✗ Not downloaded", file=sys.stderr)
-        return
+        return 0
     
     # Compare character in all fonts
     if args.compare:
@@ -529,16 +1233,15 @@ Examples:
         
         converters = {}
         for font_id in FONTS:
-            font_path = os.path.join(FONTS_DIR, FONTS[font_id]['name'])
-            if os.path.exists(font_path):
+            if font_id in available_fonts:
                 try:
-                    converters[font_id] = UnicodeGlyphConverter(font_id, auto_download=False)
+                    converters[font_id] = _get_converter(font_id)
                 except:
                     pass
         
         if not converters:
             print("No fonts available. Download fonts first.", file=sys.stderr)
-            return
+            return 1
         
         # Create comparison SVG
         viewbox_size = 1024
@@ -553,9 +1256,9 @@ Examples:
      width="{viewbox_size}" 
      height="{viewbox_size}">''')
         
-        svg_parts.append(f'  <text x="50%" y="5%" text-anchor="middle" font-size="60">')
-        svg_parts.append(f'    {char} (U+{char_code:04X})')
-        svg_parts.append(f'  </text>')
+        svg_parts.append(f'''  <text x="50%" y="5%" text-anchor="middle" font-size="60">
+    {char} (U+{char_code:04X})
+  </text>''')
         
         for i, (font_id, converter) in enumerate(converters.items()):
             col = i % columns
@@ -568,7 +1271,7 @@ Examples:
             
             if supported:
                 try:
-                    path_data, bbox, scale, _ = converter.glyph_to_path_data(char, cell_size * 0.6)
+                    path_data, bbox, scale, _ = converter.glyph_to_path_data(char, cell_size * 0.6, args.precision)
                     
                     glyph_width = bbox[2] - bbox[0]
                     glyph_height = bbox[3] - bbox[1]
@@ -578,31 +1281,29 @@ Examples:
                     path_x = center_x - scaled_width / 2
                     path_y = center_y - scaled_height / 2
                     
-                    svg_parts.append(f'  <g transform="translate({path_x:.1f} {path_y:.1f})">')
-                    svg_parts.append(f'    <path d="{path_data}" fill="black"/>')
-                    svg_parts.append(f'  </g>')
-                    
-                    # Font label
-                    svg_parts.append(f'  <text x="{center_x}" y="{center_y + cell_size*0.4}"')
-                    svg_parts.append(f'        text-anchor="middle" font-size="30">')
-                    svg_parts.append(f'    {font_id} ✓')
-                    svg_parts.append(f'  </text>')
+                    # Glyph and font label
+                    svg_parts.append(f'''  <g transform="translate({path_x:.1f} {path_y:.1f})">
+    <path d="{path_data}" fill="black"/>
+  </g>
+  <text x="{center_x}" y="{center_y + cell_size*0.4}"
+        text-anchor="middle" font-size="30">
+    {font_id} ✓
+  </text>''')
                     
                 except Exception as e:
-                    svg_parts.append(f'  <text x="{center_x}" y="{center_y}"')
-                    svg_parts.append(f'        text-anchor="middle" font-size="40" fill="red">')
-                    svg_parts.append(f'    Error')
-                    svg_parts.append(f'  </text>')
+                    svg_parts.append(f'''  <text x="{center_x}" y="{center_y}"
+        text-anchor="middle" font-size="40" fill="red">
+    Error
+  </text>''')
             else:
-                svg_parts.append(f'  <text x="{center_x}" y="{center_y}"')
-                svg_parts.append(f'        text-anchor="middle" font-size="60" fill="#ccc">')
-                svg_parts.append(f'    ✗')
-                svg_parts.append(f'  </text>')
-                
-                svg_parts.append(f'  <text x="{center_x}" y="{center_y + cell_size*0.4}"')
-                svg_parts.append(f'        text-anchor="middle" font-size="30" fill="#999">')
-                svg_parts.append(f'    {font_id}')
-                svg_parts.append(f'  </text>')
+                svg_parts.append(f'''  <text x="{center_x}" y="{center_y}"
+        text-anchor="middle" font-size="60" fill="#ccc">
+    ✗
+  </text>
+  <text x="{center_x}" y="{center_y + cell_size*0.4}"
+        text-anchor="middle" font-size="30" fill="#999">
+    {font_id}
+  </text>''')
         
         svg_parts.append('</svg>')
         
@@ -611,132 +1312,129 @@ Examples:
             f.write('\n'.join(svg_parts))
         
         print(f"Comparison saved to: {output_file}", file=sys.stderr)
-        return
+        return 0
     
     # Batch conversion
-    if args.batch:
+    if args.batch_file:
+        try:
+            if args.batch_file == '-':
+                text = sys.stdin.read()
+            else:
+                with open(args.batch_file, 'r', encoding='utf-8') as f:
+                    text = f.read()
+        except (OSError, UnicodeDecodeError) as e:
+            print(f"Error: {e}", file=sys.stderr)
+            return 1
+        chars = _batch_chars(text, args.batch_format)
+        if not chars:
+            print(f"No characters in {args.batch_file}", file=sys.stderr)
+            return 1
+        
+        if args.path_only:
+            # One process, one converter per font: stream paths to stdout
+            font_map = _auto_font_map() if args.auto else None
+            used = {}
+            status = 0
+            for char in chars:
+                font_id = font_map.get(ord(char)) if font_map is not None else args.font
+                if font_id is None:
+                    _write_stdout(f'<!-- Error: No font supports U+{ord(char):04X} -->')
+                    status = 1
+                    continue
+                try:
+                    converter = used[font_id] = _get_converter(font_id)
+                except FileNotFoundError as e:
+                    _print_missing_font(e)
+                    return 1
+                except (OSError, RuntimeError) as e:
+                    _write_stdout(f'<!-- Error: {e} -->')
+                    status = 1
+                    continue
+                if not converter.check_character_support(char)[0]:
+                    status = 1
+                _write_stdout(converter.create_path_only(char, args.size, args.color,
+                                                         args.precision))
+            for converter in used.values():
+                converter.save_cache()
+            return status
+    else:
         chars = args.batch
+    
+    if chars:
         output_dir = args.batch_dir
         os.makedirs(output_dir, exist_ok=True)
         
         print(f"Batch converting: {chars}", file=sys.stderr)
         
-        for i, char in enumerate(chars):
-            try:
-                if args.auto:
-                    # Auto-select font
-                    converter = None
-                    for font_id in ['notomath', 'symbola', 'notosans']:
-                        font_path = os.path.join(FONTS_DIR, FONTS[font_id]['name'])
-                        if os.path.exists(font_path):
-                            try:
-                                temp_conv = UnicodeGlyphConverter(font_id, auto_download=False)
-                                if temp_conv.check_character_support(char)[0]:
-                                    converter = temp_conv
-                                    break
-                            except:
-                                continue
-                    
-                    if not converter:
-                        print(f"  {i+1:3d}. {char}: No font supports this character", file=sys.stderr)
-                        continue
-                else:
-                    converter = UnicodeGlyphConverter(args.font, auto_download=False)
-                
-                svg = converter.create_centered_svg(
-                    char, args.viewbox, args.size,
-                    args.color, args.stroke, args.stroke_width
-                )
-                
-                # Create filename
-                hex_code = f"U{ord(char):04X}"
-                font_suffix = f"_{converter.font_name}" if args.auto else ""
-                filename = f"{i:03d}_{hex_code}{font_suffix}.svg"
-                filepath = os.path.join(output_dir, filename)
-                
-                with open(filepath, 'w', encoding='utf-8') as f:
-                    f.write(svg)
-                
-                print(f"  {i+1:3d}. {char} → {filename}", file=sys.stderr)
-                
-            except Exception as e:
-                print(f"  {i+1:3d}. {char}: ERROR - {e}", file=sys.stderr)
+        # Glyph rendering is CPU-bound and independent per character;
+        # each worker process keeps its own _get_converter cache
+        dir_prefix = os.path.join(output_dir, '')
+        if args.auto:
+            # Resolve each character's font up front from the merged cmap
+            font_map = _auto_font_map()
+            tasks = [(i, char, font_map.get(ord(char)), dir_prefix, args)
+                     for i, char in enumerate(chars)]
+        else:
+            tasks = [(i, char, args.font, dir_prefix, args) for i, char in enumerate(chars)]
+        from concurrent.futures import ProcessPoolExecutor
+        failed = 0
+        with ProcessPoolExecutor(max_workers=min(len(tasks), os.cpu_count() or 1)) as executor:
+            for ok, status in executor.map(_render_one, tasks):
+                print(status, file=sys.stderr)
+                failed += not ok
         
         print(f"\nBatch complete. Files in: {output_dir}/", file=sys.stderr)
-        return
+        if failed:
+            print(f"{failed} of {len(tasks)} characters failed", file=sys.stderr)
+            return 1
+        return 0
     
     # Single character conversion
     if not args.char:
         parser.print_help()
-        return
+        return 0
     
     char = args.char[0] if len(args.char) > 1 else args.char
     
     try:
         if args.auto:
             # Try fonts in order: notomath → symbola → notosans
-            font_used = None
-            converter = None
-            
-            for font_id in ['notomath', 'symbola', 'notosans']:
-                font_path = os.path.join(FONTS_DIR, FONTS[font_id]['name'])
-                if os.path.exists(font_path):
-                    try:
-                        temp_conv = UnicodeGlyphConverter(font_id, auto_download=False)
-                        if temp_conv.check_character_support(char)[0]:
-                            converter = temp_conv
-                            font_used = font_id
-                            break
-                    except:
-                        continue
-            
-            if not converter:
-                # Try any available font
-                for font_id in FONTS:
-                    font_path = os.path.join(FONTS_DIR, FONTS[font_id]['name'])
-                    if os.path.exists(font_path):
-                        try:
-                            converter = UnicodeGlyphConverter(font_id, auto_download=False)
-                            font_used = font_id
-                            break
-                        except:
-                            continue
-            
-            if not converter:
-                raise ValueError("No fonts available. Download fonts first.")
-            
+            converter, font_used = _auto_converter(char, available_fonts)
             print(f"Auto-selected font: {font_used}", file=sys.stderr)
         else:
-            converter = UnicodeGlyphConverter(args.font, auto_download=False)
+            converter = _get_converter(args.font)
+        
+        # A missing glyph still writes the error SVG (or comment) but fails the run
+        supported = converter.check_character_support(char)[0]
+        if not supported and not args.path_only:
+            # create_centered_svg falls back to the other fonts
+            supported = converter.try_multiple_fonts(char)[0] is not None
         
         if args.path_only:
-            path = converter.create_path_only(char, args.size, args.color)
-            print(path)
+            _write_stdout(converter.create_path_only(char, args.size, args.color, args.precision))
         else:
-            svg = converter.create_centered_svg(
-                char, args.viewbox, args.size,
-                args.color, args.stroke, args.stroke_width
-            )
-            
-            if args.minimal:
-                import re
-                svg = re.sub(r'<!--.*?-->', '', svg, flags=re.DOTALL)
-                svg = re.sub(r'\n\s*\n', '\n', svg)
-                svg = svg.strip()
+            svg_args = (char, args.viewbox, args.size, args.color, args.stroke,
+                        args.stroke_width, args.precision, args.minimal)
             
             if args.output:
-                with open(args.output, 'w', encoding='utf-8') as f:
-                    f.write(svg)
+                # Stream header, path data and footer without joining them;
+                # binary mode: one UTF-8 encode, no newline translation
+                with open(args.output, 'wb', buffering=64 * 1024) as f:
+                    f.writelines(chunk.encode('utf-8')
+                                 for chunk in converter.iter_centered_svg(*svg_args))
                 print(f"\nSVG saved to: {args.output}", file=sys.stderr)
             else:
-                print(svg)
+                _write_stdout(converter.create_centered_svg(*svg_args))
+        
+        # Persist cmap and rendered path for the next invocation
+        converter.save_cache()
+        return 0 if supported else 1
                 
     except FileNotFoundError as e:
-        print(f"\nERROR: {e}", file=sys.stderr)
-        print(f"\nDownload fonts first:", file=sys.stderr)
-        print(f"  python {os.path.basename(__file__)} --download-all", file=sys.stderr)
+        _print_missing_font(e)
     except Exception as e:
         print(f"Error: {e}", file=sys.stderr)
+    return 1
 
 if __name__ == '__main__':
-    main()
+    sys.exit(main(sys.argv[1:]))